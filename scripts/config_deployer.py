@@ -7,24 +7,38 @@ Deploys configurations to network devices using Netmiko
 import yaml
 import sys
 import os
-from netmiko import ConnectHandler
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from netmiko.exceptions import NetmikoTimeoutException, NetmikoAuthenticationException
 
+from _yaml_cache import load_config
+from connection_pool import pool
+
+# Distinguishes "config not provided" from a parsed config that is None
+_UNSET = object()
+
 
 class ConfigDeployer:
     """Deploys network configurations to devices"""
-    
-    def __init__(self, config_file, dry_run=False):
+
+    def __init__(self, config_file, dry_run=False, config=_UNSET):
         self.config_file = config_file
-        self.config = self._load_config()
+        self.config = config if config is not _UNSET else self._load_config()
         self.dry_run = dry_run
         self.device_config = None
-    
+        # Read credential environment variables once; this also makes
+        # them easy to monkeypatch in tests
+        self._env = {
+            'NETWORK_USERNAME': os.getenv('NETWORK_USERNAME'),
+            'NETWORK_PASSWORD': os.getenv('NETWORK_PASSWORD'),
+            'NETWORK_ENABLE_PASSWORD': os.getenv('NETWORK_ENABLE_PASSWORD', ''),
+            'NETWORK_SSH_CONFIG': os.getenv('NETWORK_SSH_CONFIG', os.path.join(
+                os.path.dirname(__file__), '..', 'configs', 'ssh_config')),
+        }
+
     def _load_config(self):
         """Load YAML configuration file"""
         try:
-            with open(self.config_file, 'r') as f:
-                return yaml.safe_load(f)
+            return load_config(self.config_file)
         except FileNotFoundError:
             print(f"Error: Configuration file {self.config_file} not found")
             sys.exit(1)
@@ -41,44 +55,46 @@ class ConfigDeployer:
             print(f"Error: Generated configuration file {config_path} not found")
             sys.exit(1)
     
-    def connect_to_device(self):
-        """Establish connection to network device"""
+    def build_device_params(self):
+        """Build Netmiko connection parameters for the target device"""
         device_info = self.config.get('device', {})
-        
-        # Get credentials from environment variables or config
-        username = os.getenv('NETWORK_USERNAME', device_info.get('credentials', {}).get('username'))
-        password = os.getenv('NETWORK_PASSWORD', device_info.get('credentials', {}).get('password'))
+
+        # Credentials resolved at init from environment, falling back to config
+        username = self._env['NETWORK_USERNAME']
+        if username is None:
+            username = device_info.get('credentials', {}).get('username')
+        password = self._env['NETWORK_PASSWORD']
+        if password is None:
+            password = device_info.get('credentials', {}).get('password')
 
         # Substitute environment variables in password
         if password and '${' in password:
             password = os.path.expandvars(password)
-        
+
         device_params = {
             'device_type': device_info.get('device_type', 'cisco_ios'),
             'host': device_info.get('ip_address'),
             'username': username,
             'password': password,
-            'secret': os.getenv('NETWORK_ENABLE_PASSWORD', ''),
+            'secret': self._env['NETWORK_ENABLE_PASSWORD'],
+            # Skip Netmiko's per-command delay pauses; the prompt on
+            # these platforms is stable enough for fast mode
+            'fast_cli': True,
         }
 
+        # Honor the repo-local OpenSSH config; paramiko reads it for
+        # host/user/ProxyCommand resolution (its ControlMaster options
+        # only matter when a ProxyCommand shells out to real ssh —
+        # reuse of our own connections comes from the connection pool)
+        ssh_config = self._env['NETWORK_SSH_CONFIG']
+        if os.path.isfile(ssh_config):
+            device_params['ssh_config_file'] = ssh_config
+
         if not device_params['host']:
             print("✗ Device IP address not found in configuration.")
             sys.exit(1)
-        
-        try:
-            connection = ConnectHandler(**device_params)
-            hostname = device_info.get('hostname', device_params['host'])
-            print(f"✓ Connected to {hostname} ({device_params['host']})")
-            return connection
-        except NetmikoTimeoutException:
-            print(f"✗ Connection timeout to {device_params['host']}")
-            sys.exit(1)
-        except NetmikoAuthenticationException:
-            print(f"✗ Authentication failed for {device_params['host']}")
-            sys.exit(1)
-        except Exception as e:
-            print(f"✗ Connection error: {e}")
-            sys.exit(1)
+
+        return device_params
     
     def deploy_config(self, connection, config_commands):
         """Deploy configuration to device"""
@@ -90,12 +106,19 @@ class ConfigDeployer:
             return True
         
         try:
-            # Enter enable mode if needed
-            if connection.check_enable_mode():
+            # Escalate only when an enable secret is configured; the old
+            # check_enable_mode() probe cost a round trip and was inverted
+            # (it returns True when already in enable mode)
+            if connection.secret:
                 connection.enable()
-            
-            # Send configuration commands
-            output = connection.send_config_set(config_commands.split('\n'))
+
+            # Send configuration commands in one batch without per-command
+            # echo verification, avoiding a prompt-read round trip per line
+            output = connection.send_config_set(
+                config_commands.split('\n'),
+                cmd_verify=False,
+                read_timeout_override=30,
+            )
             print("\n✓ Configuration deployed successfully")
             print("\nDevice output:")
             print(output)
@@ -112,11 +135,12 @@ class ConfigDeployer:
     def verify_connection(self, connection):
         """Verify device connectivity and basic info"""
         try:
-            output = connection.send_command("show version")
+            # find_prompt is a single short round-trip; 'show version'
+            # rendered kilobytes of output we immediately discarded
+            prompt = connection.find_prompt()
+            hostname = prompt.rstrip('#>')
             print("\nDevice Information:")
             print("-" * 50)
-            # Extract hostname from show version or use config
-            hostname = self.config['device']['hostname']
             print(f"Hostname: {hostname}")
             print("-" * 50)
             return True
@@ -130,33 +154,99 @@ class ConfigDeployer:
         
         if self.dry_run:
             print("\n[DRY RUN MODE - No changes will be made]")
-        
-        connection = self.connect_to_device()
-        
+
+        device_params = self.build_device_params()
+        hostname = self.config.get('device', {}).get('hostname', device_params['host'])
+
         try:
-            self.verify_connection(connection)
-            success = self.deploy_config(connection, self.device_config)
-            return success
-        finally:
-            connection.disconnect()
-            print("\n✓ Disconnected from device")
+            # Borrow a pooled connection; it is kept alive for reuse by
+            # later deploys instead of being torn down here
+            with pool.get(device_params) as connection:
+                print(f"✓ Connected to {hostname} ({device_params['host']})")
+                self.verify_connection(connection)
+                success = self.deploy_config(connection, self.device_config)
+                return success
+        except NetmikoTimeoutException:
+            print(f"✗ Connection timeout to {device_params['host']}")
+            sys.exit(1)
+        except NetmikoAuthenticationException:
+            print(f"✗ Authentication failed for {device_params['host']}")
+            sys.exit(1)
+        except Exception as e:
+            print(f"✗ Connection error: {e}")
+            sys.exit(1)
+
+
+def build_deploy_targets(targets):
+    """Pair each YAML device config with its generated configuration.
+
+    Each .yaml argument may be followed by an explicit generated config
+    path; otherwise generated_configs/<device>.cfg is assumed.
+    """
+    pairs = []
+    for arg in targets:
+        if arg.endswith(('.yaml', '.yml')):
+            device_name = os.path.splitext(os.path.basename(arg))[0]
+            pairs.append((arg, os.path.join('generated_configs', f'{device_name}.cfg')))
+        elif pairs:
+            pairs[-1] = (pairs[-1][0], arg)
+        else:
+            print(f"✗ Expected a YAML device config before {arg}")
+            sys.exit(1)
+    return pairs
 
 
 def main():
     """Main function"""
     import argparse
-    
-    parser = argparse.ArgumentParser(description='Deploy network configuration to device')
-    parser.add_argument('config_file', help='YAML configuration file')
-    parser.add_argument('generated_config', help='Generated configuration file to deploy')
+
+    parser = argparse.ArgumentParser(description='Deploy network configurations to devices')
+    parser.add_argument('targets', nargs='+', metavar='config',
+                        help='YAML device config(s), each optionally followed by its '
+                             'generated config file (default: generated_configs/<device>.cfg)')
     parser.add_argument('--dry-run', action='store_true', help='Dry run mode (no actual deployment)')
-    
+    parser.add_argument('--max-workers', type=int, default=None,
+                        help='Maximum parallel deployments (default: one per device, capped at 32)')
+
     args = parser.parse_args()
-    
-    deployer = ConfigDeployer(args.config_file, dry_run=args.dry_run)
-    success = deployer.deploy(args.generated_config)
-    
-    sys.exit(0 if success else 1)
+    pairs = build_deploy_targets(args.targets)
+
+    if len(pairs) == 1:
+        config_file, generated_config = pairs[0]
+        deployer = ConfigDeployer(config_file, dry_run=args.dry_run)
+        sys.exit(0 if deployer.deploy(generated_config) else 1)
+
+    # Netmiko blocks on socket I/O with the GIL released, so threads fan
+    # the deploys out near-linearly up to the device count
+    workers = args.max_workers or min(32, len(pairs))
+    results = {}
+
+    def deploy_one(config_file, generated_config):
+        # Construct inside the worker: _load_config exits on a bad YAML
+        # file, and that must fail this device, not the whole fan-out
+        return ConfigDeployer(config_file, dry_run=args.dry_run).deploy(generated_config)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(deploy_one, config_file, generated_config): config_file
+            for config_file, generated_config in pairs
+        }
+        for future in as_completed(futures):
+            config_file = futures[future]
+            try:
+                results[config_file] = future.result()
+            except SystemExit:
+                results[config_file] = False
+            except Exception as e:
+                print(f"✗ Deployment of {config_file} failed: {e}")
+                results[config_file] = False
+
+    failed = [config_file for config_file, success in results.items() if not success]
+    print(f"\n=== Deployed {len(pairs) - len(failed)}/{len(pairs)} device(s) successfully ===")
+    for config_file in failed:
+        print(f"  ✗ {config_file}")
+
+    sys.exit(1 if failed else 0)
 
 
 if __name__ == "__main__":
@@ -9,19 +9,37 @@ import os
 import sys
 from pathlib import Path
 
+from jinja2 import Environment, FileSystemLoader
+
+from _yaml_cache import load_config
+
+_TEMPLATE_DIR = Path(__file__).parent / 'templates'
+
+# Distinguishes "config not provided" from a parsed config that is None
+_UNSET = object()
+
 
 class ConfigGenerator:
     """Generates network device configurations from YAML templates"""
-    
-    def __init__(self, config_file):
+
+    # Compiled once at import and shared by every instance; each render
+    # is then straight-line string building in Jinja's generated code
+    _env = Environment(
+        loader=FileSystemLoader(str(_TEMPLATE_DIR)),
+        auto_reload=False,
+        trim_blocks=True,
+        lstrip_blocks=True,
+    )
+    _template = _env.get_template('ios_config.j2')
+
+    def __init__(self, config_file, config=_UNSET):
         self.config_file = config_file
-        self.config = self._load_config()
-    
+        self.config = config if config is not _UNSET else self._load_config()
+
     def _load_config(self):
         """Load YAML configuration file"""
         try:
-            with open(self.config_file, 'r') as f:
-                return yaml.safe_load(f)
+            return load_config(self.config_file)
         except FileNotFoundError:
             print(f"Error: Configuration file {self.config_file} not found")
             sys.exit(1)
@@ -29,106 +47,75 @@ class ConfigGenerator:
             print(f"Error parsing YAML: {e}")
             sys.exit(1)
     
-    def generate_hostname(self):
-        """Generate hostname configuration"""
-        hostname = self.config.get('device', {}).get('hostname', 'default-hostname')
-        return f"hostname {hostname}\n"
-    
-    def generate_interfaces(self):
-        """Generate interface configurations"""
-        commands = []
-        for interface in self.config.get('interfaces', []):
+    def _render_context(self):
+        """Normalize the config once so the template renders with plain
+        field access instead of a default-filter per lookup"""
+        cfg = self.config or {}
+
+        interfaces = []
+        for interface in cfg.get('interfaces') or []:
             name = interface.get('name')
             if not name:
                 continue  # Skip interface if name is missing
-            commands.append(f"interface {name}")
-            description = interface.get('description', f'Interface {name}')
-            commands.append(f" description {description}")
-            
-            status = interface.get('status', 'down')
-            if status == 'up':
-                commands.append(" no shutdown")
-            else:
-                commands.append(" shutdown")
-
+            entry = {
+                'name': name,
+                'description': interface.get('description', f'Interface {name}'),
+                'up': interface.get('status', 'down') == 'up',
+            }
             if 'ip_address' in interface and 'subnet_mask' in interface:
-                ip = interface['ip_address']
-                mask = interface['subnet_mask']
-                commands.append(f" ip address {ip} {mask}")
-            commands.append("!")
-        return "\n".join(commands) + "\n"
-    
-    def generate_ospf(self):
-        """Generate OSPF routing configuration"""
-        commands = []
-        ospf_config = self.config.get('routing', {}).get('ospf', {})
-        
-        if ospf_config.get('enabled', False):
-            process_id = ospf_config.get('process_id')
-            if not process_id:
-                return "" # Cannot configure OSPF without a process ID
-            commands.append(f"router ospf {process_id}")
-            for network in ospf_config.get('networks', []):
-                net = network.get('network')
-                wildcard = network.get('wildcard')
-                area = network.get('area')
-                if net and wildcard and area is not None:
-                    commands.append(f" network {net} {wildcard} area {area}")
-            commands.append("!")
-        
-        return "\n".join(commands) + "\n" if commands else ""
-    
-    def generate_acl(self):
-        """Generate access control list configuration"""
-        commands = []
-        acls = self.config.get('security', {}).get('access_lists', [])
-        
-        for acl in acls:
-            acl_name = acl.get('name')
-            acl_type = acl.get('type')
-            if not acl_name or not acl_type:
-                continue # Skip ACL if name or type is missing
-
-            for rule in acl.get('rules', []):
-                action = rule.get('action')
-                protocol = rule.get('protocol')
-                source = rule.get('source')
-                
-                if not all([action, protocol, source]):
-                    continue # Skip rule with missing required fields
-
-                src_wildcard = rule.get('source_wildcard', '0.0.0.0')
-                destination = rule.get('destination', 'any')
-                dst_port = rule.get('destination_port')
-                
-                if acl_type == 'extended':
-                    cmd_parts = [f"access-list {acl_name}", action, protocol, source, src_wildcard, destination]
-                    if dst_port:
-                        cmd_parts.append(f"eq {dst_port}")
-                    commands.append(" ".join(cmd_parts))
-        
-        return "\n".join(commands) + "\n" if commands else ""
-    
+                entry['ip_address'] = interface['ip_address']
+                entry['subnet_mask'] = interface['subnet_mask']
+            interfaces.append(entry)
+
+        ospf_config = (cfg.get('routing') or {}).get('ospf') or {}
+        ospf = None
+        if ospf_config.get('enabled', False) and ospf_config.get('process_id'):
+            ospf = {
+                'process_id': ospf_config['process_id'],
+                'networks': [
+                    network for network in ospf_config.get('networks') or []
+                    if network.get('network') and network.get('wildcard')
+                    and network.get('area') is not None
+                ],
+            }
+
+        access_lists = []
+        for acl in (cfg.get('security') or {}).get('access_lists') or []:
+            # Only named extended ACLs produce commands
+            if not acl.get('name') or acl.get('type') != 'extended':
+                continue
+            rules = []
+            for rule in acl.get('rules') or []:
+                if not all([rule.get('action'), rule.get('protocol'), rule.get('source')]):
+                    continue  # Skip rule with missing required fields
+                rules.append({
+                    'action': rule['action'],
+                    'protocol': rule['protocol'],
+                    'source': rule['source'],
+                    'source_wildcard': rule.get('source_wildcard', '0.0.0.0'),
+                    'destination': rule.get('destination', 'any'),
+                    'destination_port': rule.get('destination_port'),
+                })
+            access_lists.append({'name': acl['name'], 'rules': rules})
+
+        return {
+            'device': cfg.get('device') or {},
+            'interfaces': interfaces,
+            'ospf': ospf,
+            'access_lists': access_lists,
+        }
+
     def generate_full_config(self):
         """Generate complete device configuration"""
-        config_lines = []
-        hostname = self.config.get('device', {}).get('hostname', 'Unknown-Device')
-        config_lines.append("! Generated Configuration")
-        config_lines.append(f"! Device: {hostname}")
-        config_lines.append("!")
-        config_lines.append(self.generate_hostname())
-        config_lines.append(self.generate_interfaces())
-        config_lines.append(self.generate_ospf())
-        config_lines.append(self.generate_acl())
-        config_lines.append("end")
-        
-        return "\n".join(config_lines)
-    
-    def save_config(self, output_file):
+        return self._template.render(self._render_context())
+
+    def save_config(self, output_file, config=None):
         """Save generated configuration to file"""
-        config = self.generate_full_config()
-        with open(output_file, 'w') as f:
-            f.write(config)
+        if config is None:
+            config = self.generate_full_config()
+        # One write(2) of encoded bytes; skips the text-mode newline
+        # translation and codec machinery
+        Path(output_file).write_bytes(config.encode('utf-8'))
         print(f"Configuration saved to {output_file}")
 
 
@@ -141,12 +128,14 @@ def main():
     config_file = sys.argv[1]
     output_file = sys.argv[2] if len(sys.argv) > 2 else config_file.replace('.yaml', '.cfg')
     
+    # Generate once, then write to both sinks
     generator = ConfigGenerator(config_file)
-    generator.save_config(output_file)
-    
+    config = generator.generate_full_config()
+    generator.save_config(output_file, config)
+
     # Also print to stdout for CI/CD pipelines
     print("\n--- Generated Configuration ---")
-    print(generator.generate_full_config())
+    print(config)
 
 
 if __name__ == "__main__":
@@ -6,24 +6,248 @@ Validates network configurations before deployment
 
 import yaml
 import sys
+import hashlib
+import ipaddress
+import json
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import jsonschema
+
+try:
+    # Rust-backed schema engine; same schema, no interpreter in the
+    # validation hot loop. Purely opportunistic, like pyfastyaml.
+    import jsonschema_rs as _jsonschema_rs
+except ImportError:
+    _jsonschema_rs = None
+
+from _yaml_cache import load_config, load_stream
+
+# Structural rules (required fields, enums, field dependencies) expressed
+# once as JSON Schema; semantic checks that need real parsing (IP
+# addresses, masks) or produce warnings stay in the validator methods.
+CONFIG_SCHEMA = {
+    "$schema": "https://json-schema.org/draft/2020-12/schema",
+    "type": "object",
+    "required": ["device"],
+    "properties": {
+        "device": {
+            "type": "object",
+            "required": ["hostname", "ip_address"],
+            "properties": {
+                "hostname": {"type": "string", "minLength": 1},
+                "ip_address": {"type": "string", "minLength": 1},
+            },
+        },
+        "interfaces": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["name", "description", "status"],
+                "dependentRequired": {"ip_address": ["subnet_mask"]},
+                "properties": {
+                    "name": {"type": "string", "minLength": 1},
+                    "description": {"type": "string", "minLength": 1},
+                    "status": {"type": "string", "minLength": 1},
+                },
+            },
+        },
+        "routing": {
+            "type": "object",
+            "properties": {
+                "ospf": {
+                    "type": "object",
+                    "if": {
+                        "properties": {"enabled": {"const": True}},
+                        "required": ["enabled"],
+                    },
+                    "then": {"required": ["process_id"]},
+                    "properties": {
+                        "networks": {
+                            "type": "array",
+                            "items": {
+                                "type": "object",
+                                "required": ["network", "wildcard", "area"],
+                                "properties": {
+                                    "area": {"type": ["integer", "string"]},
+                                },
+                            },
+                        },
+                    },
+                },
+            },
+        },
+        "security": {
+            "type": "object",
+            "properties": {
+                "access_lists": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "required": ["name", "type"],
+                        "properties": {
+                            "type": {"enum": ["standard", "extended"]},
+                            "rules": {
+                                "type": "array",
+                                "items": {
+                                    "type": "object",
+                                    "required": ["action", "protocol", "source"],
+                                    "properties": {
+                                        "action": {"enum": ["permit", "deny"]},
+                                    },
+                                },
+                            },
+                        },
+                    },
+                },
+            },
+        },
+    },
+}
+
+# Compiled once at import time; each validation is then a single pass.
+# Both backends yield "<json path>: <message>" strings so the rest of
+# the validator never cares which engine produced them.
+if _jsonschema_rs is not None:
+    _SCHEMA_VALIDATOR = _jsonschema_rs.validator_for(CONFIG_SCHEMA)
+
+    def _iter_schema_errors(config):
+        for error in _SCHEMA_VALIDATOR.iter_errors(config):
+            path = '$' + ''.join(
+                f'.{part}' if isinstance(part, str) else f'[{part}]'
+                for part in error.instance_path)
+            yield f"{path}: {error.message}"
+else:
+    _SCHEMA_VALIDATOR = jsonschema.Draft202012Validator(CONFIG_SCHEMA)
+
+    def _iter_schema_errors(config):
+        for error in _SCHEMA_VALIDATOR.iter_errors(config):
+            yield f"{error.json_path}: {error.message}"
+
+# Strict dotted-quad pattern (each octet 0-255, no leading zeros padding
+# beyond the plain forms). A failed match is just None, whereas
+# ipaddress.IPv4Address pays exception construction on every invalid
+# input — the path the negative tests hammer.
+_IP_RE = re.compile(
+    r'^(?:(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)\.){3}'
+    r'(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)$')
+
+# Protocols that don't warrant an 'uncommon protocol' warning; a frozen
+# set gives a single hashed membership probe per rule
+_COMMON_PROTOCOLS = frozenset({'tcp', 'udp', 'ip', 'icmp'})
+
+# Run the semantic section validators in parallel once a config has at
+# least this many interfaces + networks + ACL rules
+_PARALLEL_THRESHOLD = 100
+
+# Validation results memoized by content hash of the parsed config, so
+# re-validating a structurally identical config is one dict lookup
+_RESULT_CACHE = {}
+_RESULT_CACHE_MAX = 256
+
+
+def _config_digest(config):
+    """Canonical-JSON blake2b digest of a parsed config, or None when
+    the config holds something JSON cannot represent"""
+    try:
+        payload = json.dumps(config, sort_keys=True, separators=(',', ':'))
+    except (TypeError, ValueError):
+        return None
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).digest()
+
+
+# Per-section results memoized by subtree content hash: configs often
+# share identical device/interface blocks, and a repeated subtree then
+# costs one lookup instead of a re-walk
+_SUB_CACHE = {}
+_SUB_CACHE_MAX = 1024
+
+# Distinguishes "config not provided" from a parsed config that is None
+# (an empty YAML document), which the schema then rejects normally
+_UNSET = object()
+
+
+def _memo_section(name, subtree, section):
+    """Run a section validator, memoized on its subtree's content"""
+    digest = _config_digest(subtree)
+    if digest is None:
+        return section()
+    key = (name, digest)
+    cached = _SUB_CACHE.get(key)
+    if cached is None:
+        if len(_SUB_CACHE) >= _SUB_CACHE_MAX:
+            _SUB_CACHE.clear()
+        errors, warnings, ip_checks = section()
+        cached = (tuple(errors), tuple(warnings), tuple(ip_checks))
+        _SUB_CACHE[key] = cached
+    return cached
+
 
 class ConfigValidator:
     """Validates network device configurations"""
-    
-    def __init__(self, config_file):
+
+    def __init__(self, config_file, config=_UNSET):
         self.config_file = config_file
-        self.config = self._load_config()
+        self.config = config if config is not _UNSET else self._load_config()
         self.errors = []
         self.warnings = []
-    
+        self._errors_blob = None
+
+    @classmethod
+    def from_stream(cls, stream):
+        """Build a validator from a file-like object of YAML text,
+        avoiding any filesystem access"""
+        return cls(config_file=getattr(stream, 'name', '<stream>'),
+                   config=load_stream(stream))
+
+    @classmethod
+    def from_dict(cls, config):
+        """Build a validator from an already-parsed config dict,
+        skipping file I/O and YAML parsing entirely"""
+        return cls(config_file='<dict>', config=config)
+
+    @classmethod
+    def validate_many(cls, configs):
+        """Validate an iterable of parsed config dicts.
+
+        One validator instance (and the module-level compiled schema and
+        caches behind it) is shared across all inputs; yields an
+        (errors, is_valid) tuple per config.
+        """
+        validator = cls.from_dict({})
+        for config in configs:
+            validator.load(config)
+            validator.validate_all()
+            yield list(validator.errors), validator.is_valid()
+
+    def load(self, source):
+        """Point this validator at a new config and reset its state.
+
+        Accepts a path, a file-like object, or an already-parsed dict.
+        The compiled schema and result caches live at module level, so
+        reusing one instance across many configs rebuilds nothing.
+        """
+        if source is None or isinstance(source, dict):
+            # None is a parsed-empty document, not a path; the schema
+            # pass rejects it with a clean error
+            self.config_file = '<dict>'
+            self.config = source
+        elif hasattr(source, 'read'):
+            self.config_file = getattr(source, 'name', '<stream>')
+            self.config = load_stream(source)
+        else:
+            self.config_file = source
+            self.config = self._load_config()
+        self.errors = []
+        self.warnings = []
+        self._errors_blob = None
+        return self
+
     def _load_config(self):
         """Load YAML configuration file"""
         try:
-            with open(self.config_file, 'r') as f:
-                return yaml.safe_load(f)
+            return load_config(self.config_file)
         except FileNotFoundError:
             print(f"Error: Configuration file {self.config_file} not found")
             sys.exit(1)
@@ -33,112 +257,195 @@ class ConfigValidator:
     
     def validate_ip_address(self, ip):
         """Validate IP address format"""
-        pattern = r'^(\d{1,3}\.){3}\d{1,3}$'
-        if not re.match(pattern, ip):
-            return False
-        
-        parts = ip.split('.')
-        return all(0 <= int(part) <= 255 for part in parts)
-    
+        return isinstance(ip, str) and _IP_RE.match(ip) is not None
+
     def validate_subnet_mask(self, mask):
-        """Validate subnet mask format"""
-        return self.validate_ip_address(mask)
+        """Validate subnet mask format and contiguity"""
+        try:
+            # Accepts netmasks (and hostmasks); rejects non-contiguous
+            # masks like 255.0.255.0
+            ipaddress.IPv4Network(('0.0.0.0', mask))
+            return True
+        except (ValueError, TypeError):
+            return False
     
     def validate_device_info(self):
-        """Validate device information"""
-        device = self.config.get('device', {})
-        
-        if not device.get('hostname'):
-            self.errors.append("Device hostname is required")
-        
-        if not device.get('ip_address'):
-            self.errors.append("Device IP address is required")
-        elif not self.validate_ip_address(device['ip_address']):
-            self.errors.append(f"Invalid IP address: {device['ip_address']}")
-        
+        """Validate device information beyond the structural schema"""
+        errors, warnings, ip_checks = [], [], []
+        device = self.config.get('device')
+        if device is None:
+            return errors, warnings, ip_checks  # absence is already a schema error
+
+        if 'ip_address' in device:
+            ip_checks.append((f"Invalid IP address: {device['ip_address']}",
+                              device['ip_address'], False))
+
         if not device.get('device_type'):
-            self.warnings.append("Device type not specified, defaulting to cisco_ios")
-    
+            warnings.append("Device type not specified, defaulting to cisco_ios")
+
+        return errors, warnings, ip_checks
+
     def validate_interfaces(self):
-        """Validate interface configurations"""
+        """Validate interface IP addressing"""
+        errors, warnings, ip_checks = [], [], []
         interfaces = self.config.get('interfaces', [])
-        
+
         if not interfaces:
-            self.warnings.append("No interfaces configured")
-            return
-        
-        for idx, interface in enumerate(interfaces):
-            if not interface.get('name'):
-                self.errors.append(f"Interface {idx}: name is required")
-
-            if not interface.get('description'):
-                self.errors.append(f"Interface {interface.get('name', idx)}: description is required")
-
-            if not interface.get('status'):
-                self.errors.append(f"Interface {interface.get('name', idx)}: status is required")
-            
-            if 'ip_address' in interface:
-                ip = interface['ip_address']
-                if not self.validate_ip_address(ip):
-                    self.errors.append(f"Interface {interface.get('name', idx)}: Invalid IP address {ip}")
-                
-                if 'subnet_mask' not in interface:
-                    self.errors.append(f"Interface {interface.get('name', idx)}: Subnet mask required when IP is configured")
-                elif not self.validate_subnet_mask(interface['subnet_mask']):
-                    self.errors.append(f"Interface {interface.get('name', idx)}: Invalid subnet mask")
-    
+            warnings.append("No interfaces configured")
+            return errors, warnings, ip_checks
+
+        # Transpose the list-of-dicts into columns in one pass, then
+        # scan each column in its own tight loop: the per-interface
+        # dict probes happen once and each rule runs branch-free over
+        # a homogeneous list
+        absent = object()
+        names, ip_addresses, masks = zip(
+            *((interface.get('name', idx), interface.get('ip_address', absent),
+               interface.get('subnet_mask', absent))
+              for idx, interface in enumerate(interfaces)))
+
+        for name, ip in zip(names, ip_addresses):
+            if ip is not absent:
+                ip_checks.append((f"Interface {name}: Invalid IP address {ip}",
+                                  ip, False))
+
+        for name, mask in zip(names, masks):
+            if mask is not absent:
+                ip_checks.append((f"Interface {name}: Invalid subnet mask",
+                                  mask, True))
+
+        return errors, warnings, ip_checks
+
     def validate_routing(self):
         """Validate routing configurations"""
-        routing = self.config.get('routing', {})
-        ospf = routing.get('ospf', {})
-        
-        if ospf.get('enabled', False):
-            if not ospf.get('process_id'):
-                self.errors.append("OSPF process ID is required when OSPF is enabled")
-            
-            networks = ospf.get('networks', [])
-            if not networks:
-                self.warnings.append("OSPF enabled but no networks configured")
-            
-            for idx, network in enumerate(networks):
-                if not self.validate_ip_address(network.get('network', '')):
-                    self.errors.append(f"OSPF network {idx}: Invalid network address")
-                if not self.validate_ip_address(network.get('wildcard', '')):
-                    self.errors.append(f"OSPF network {idx}: Invalid wildcard mask")
-                if network.get('area') is None:
-                    self.errors.append(f"OSPF network {idx}: Area is required")
-    
+        errors, warnings, ip_checks = [], [], []
+        routing = self.config.get('routing')
+        if routing is None:
+            return errors, warnings, ip_checks
+
+        ospf = routing.get('ospf')
+        if not ospf or not ospf.get('enabled', False):
+            return errors, warnings, ip_checks
+
+        networks = ospf.get('networks', [])
+        if not networks:
+            warnings.append("OSPF enabled but no networks configured")
+
+        for idx, network in enumerate(networks):
+            if 'network' in network:
+                ip_checks.append((f"OSPF network {idx}: Invalid network address",
+                                  network['network'], False))
+            if 'wildcard' in network:
+                ip_checks.append((f"OSPF network {idx}: Invalid wildcard mask",
+                                  network['wildcard'], False))
+
+        return errors, warnings, ip_checks
+
     def validate_security(self):
         """Validate security configurations"""
-        security = self.config.get('security', {})
+        errors, warnings, ip_checks = [], [], []
+        security = self.config.get('security')
+        if security is None:
+            return errors, warnings, ip_checks
+
         acls = security.get('access_lists', [])
-        
+
         for acl in acls:
-            if not acl.get('name'):
-                self.errors.append("ACL name is required")
-            
-            if acl.get('type') not in ['standard', 'extended']:
-                self.errors.append(f"ACL {acl.get('name')}: Type must be 'standard' or 'extended'")
-            
+            name = acl.get('name') or '<unnamed>'
             for rule in acl.get('rules', []):
-                if rule.get('action') not in ['permit', 'deny']:
-                    self.errors.append(f"ACL {acl.get('name')}: Rule action must be 'permit' or 'deny'")
+                protocol = rule.get('protocol')
+                if protocol and protocol not in _COMMON_PROTOCOLS:
+                    warnings.append(f"ACL {name}: Uncommon protocol {protocol}")
 
-                if not rule.get('protocol'):
-                    self.errors.append(f"ACL {acl.get('name')}: Rule protocol is required")
-                elif rule.get('protocol') not in ['tcp', 'udp', 'ip', 'icmp']:
-                    self.warnings.append(f"ACL {acl.get('name')}: Uncommon protocol {rule.get('protocol')}")
+        return errors, warnings, ip_checks
+
+    def _item_count(self):
+        """Rough size of the config: items the semantic pass will visit"""
+        cfg = self.config or {}
+        ospf = (cfg.get('routing') or {}).get('ospf') or {}
+        acls = (cfg.get('security') or {}).get('access_lists') or []
+        return (len(cfg.get('interfaces') or []) +
+                len(ospf.get('networks') or []) +
+                sum(len(acl.get('rules') or []) for acl in acls))
 
-                if not rule.get('source'):
-                    self.errors.append(f"ACL {acl.get('name')}: Rule source is required")
-    
     def validate_all(self):
         """Run all validation checks"""
-        self.validate_device_info()
-        self.validate_interfaces()
-        self.validate_routing()
-        self.validate_security()
-    
+        digest = _config_digest(self.config)
+        if digest is not None:
+            cached = _RESULT_CACHE.get(digest)
+            if cached is not None:
+                errors, warnings = cached
+                self.errors.extend(errors)
+                self.warnings.extend(warnings)
+                return
+
+        start_errors, start_warnings = len(self.errors), len(self.warnings)
+        self._run_validation()
+
+        if digest is not None:
+            if len(_RESULT_CACHE) >= _RESULT_CACHE_MAX:
+                _RESULT_CACHE.clear()
+            _RESULT_CACHE[digest] = (tuple(self.errors[start_errors:]),
+                                     tuple(self.warnings[start_warnings:]))
+
+    def _run_validation(self):
+        """Uncached validation of the loaded config"""
+        # Structural pass: one traversal of the config against the
+        # pre-compiled schema covers every required-field/enum rule
+        self.errors.extend(_iter_schema_errors(self.config))
+
+        # A structural error already makes the config invalid, and the
+        # semantic checks assume the shape the schema just rejected, so
+        # short-circuit the section pass entirely in that case
+        if self.errors:
+            return
+
+        # Semantic pass: IP/mask parsing and advisory warnings. Each
+        # section depends only on its own subtree, so results are
+        # memoized per subtree, and the sections are independent, so
+        # they fan out across threads once the config is big enough for
+        # the pool overhead to pay off.
+        sections = [('device', self.validate_device_info),
+                    ('interfaces', self.validate_interfaces),
+                    ('routing', self.validate_routing),
+                    ('security', self.validate_security)]
+
+        def run_section(item):
+            key, section = item
+            return _memo_section(key, self.config.get(key), section)
+
+        if self._item_count() >= _PARALLEL_THRESHOLD:
+            with ThreadPoolExecutor(max_workers=len(sections)) as executor:
+                results = list(executor.map(run_section, sections))
+        else:
+            results = [run_section(item) for item in sections]
+
+        ip_checks = []
+        for errors, warnings, checks in results:
+            self.errors.extend(errors)
+            self.warnings.extend(warnings)
+            ip_checks.extend(checks)
+
+        # Every IP-typed field in the config is validated in one tight
+        # loop instead of scattered calls inside each section walk
+        for message, value, is_mask in ip_checks:
+            valid = (self.validate_subnet_mask(value) if is_mask
+                     else self.validate_ip_address(value))
+            if not valid:
+                self.errors.append(message)
+
+    def has_error_containing(self, needle):
+        """Case-insensitive substring search over all errors.
+
+        The errors are folded into one lowercased blob (rebuilt only
+        when the error list has grown), so each lookup is a single
+        C-level str scan instead of a Python loop that re-lowercases
+        every message.
+        """
+        if self._errors_blob is None or self._errors_blob[0] != len(self.errors):
+            self._errors_blob = (len(self.errors), '\n'.join(self.errors).lower())
+        return needle.lower() in self._errors_blob[1]
+
     def is_valid(self):
         """Check if configuration is valid"""
         return len(self.errors) == 0
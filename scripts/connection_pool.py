@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Netmiko Connection Pool
+Reuses SSH connections across deployments so repeat deploys to the
+same device skip the TCP + SSH handshake and authentication
+"""
+
+import atexit
+import threading
+import time
+from contextlib import contextmanager
+
+from netmiko import ConnectHandler
+
+IDLE_TIMEOUT = 300   # seconds before an unused connection is closed
+MAX_AGE = 3600       # seconds before a connection is retired outright
+
+
+class _PooledConnection:
+    """A live connection plus the bookkeeping needed for eviction"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.created = time.monotonic()
+        self.last_used = self.created
+
+    def expired(self, now, idle_timeout, max_age):
+        return (now - self.last_used) > idle_timeout or (now - self.created) > max_age
+
+
+class ConnectionPool:
+    """Thread-safe pool of Netmiko connections keyed by device identity"""
+
+    def __init__(self, idle_timeout=IDLE_TIMEOUT, max_age=MAX_AGE):
+        self.idle_timeout = idle_timeout
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._pool = {}
+
+    @staticmethod
+    def _key(device_params):
+        return (
+            device_params.get('host'),
+            device_params.get('port', 22),
+            device_params.get('username'),
+            device_params.get('device_type'),
+        )
+
+    @staticmethod
+    def _close(entry):
+        try:
+            entry.connection.disconnect()
+        except Exception:
+            pass  # connection may already be dead
+
+    def _evict_stale(self, now):
+        """Drop expired entries; caller must hold the lock"""
+        for key in [k for k, e in self._pool.items()
+                    if e.expired(now, self.idle_timeout, self.max_age)]:
+            self._close(self._pool.pop(key))
+
+    @contextmanager
+    def get(self, device_params):
+        """Borrow a connection for the device, connecting if needed.
+
+        The connection is returned to the pool on exit rather than
+        disconnected; call close_all() to tear everything down.
+        """
+        key = self._key(device_params)
+        with self._lock:
+            self._evict_stale(time.monotonic())
+            entry = self._pool.pop(key, None)
+
+        if entry is not None and not entry.connection.is_alive():
+            self._close(entry)
+            entry = None
+        if entry is None:
+            entry = _PooledConnection(ConnectHandler(**device_params))
+
+        try:
+            yield entry.connection
+        finally:
+            entry.last_used = time.monotonic()
+            with self._lock:
+                resident = self._pool.get(key)
+                if resident is None:
+                    self._pool[key] = entry
+                    entry = None
+            # Two borrowers of the same key each got a fresh connection;
+            # only one fits the slot, so disconnect the surplus one
+            # instead of leaking it past close_all()'s reach
+            if entry is not None:
+                self._close(entry)
+
+    def close_all(self):
+        """Disconnect and drop every pooled connection"""
+        with self._lock:
+            for entry in self._pool.values():
+                self._close(entry)
+            self._pool.clear()
+
+
+# Shared pool for the deployer scripts; emptied automatically at exit
+pool = ConnectionPool()
+atexit.register(pool.close_all)
@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+Shared pytest configuration for the test suite
+"""
+
+import pytest
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers',
+        'parallel_safe: test is safe to run under pytest-xdist workers')
+
+
+def pytest_collection_modifyitems(items):
+    # Every test writes only to its own per-class tmpdir with unique
+    # filenames, so the whole suite can fan out across xdist workers
+    for item in items:
+        item.add_marker(pytest.mark.parallel_safe)
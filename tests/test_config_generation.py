@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Unit tests for configuration generation
+"""
+
+import os
+import sys
+import unittest
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from config_generator import ConfigGenerator
+
+REPO_ROOT = os.path.join(os.path.dirname(__file__), '..')
+GOLDEN_DIR = os.path.join(os.path.dirname(__file__), 'golden')
+
+# Generated configs get diffed against running configs in operations,
+# so rendering must stay byte-for-byte stable; the golden files were
+# produced by the original string-building generator
+DEVICES = ['router-01', 'router-02']
+
+
+class TestConfigGeneration(unittest.TestCase):
+    """Test cases for configuration generation"""
+
+    def test_rendered_output_matches_golden(self):
+        """Rendering the shipped device configs reproduces the golden bytes"""
+        for device in DEVICES:
+            with self.subTest(device):
+                config_file = os.path.join(
+                    REPO_ROOT, 'configs', 'devices', f'{device}.yaml')
+                with open(os.path.join(GOLDEN_DIR, f'{device}.cfg'), 'rb') as f:
+                    expected = f.read()
+                generated = ConfigGenerator(config_file).generate_full_config()
+                self.assertEqual(generated.encode('utf-8'), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
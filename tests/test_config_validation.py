@@ -3,35 +3,99 @@
 Unit tests for configuration validation
 """
 
+import io
+import itertools
 import unittest
 import yaml
 import tempfile
 import os
 import sys
 
+try:
+    # libyaml C extension, much faster than the pure-Python dumper
+    from yaml import CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeDumper as _Dumper
+
 # Add scripts directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
 
 from config_validator import ConfigValidator
 
+# Shared device block for the data-driven cases below
+DEVICE = {'hostname': 'test-router', 'ip_address': '192.168.1.1'}
+
+# (label, config, expected error substring or None) — each case must
+# fail validation; the substring is matched case-insensitively
+INVALID_CASES = [
+    ('missing_hostname',
+     {'device': {'ip_address': '192.168.1.1', 'device_type': 'cisco_ios'}},
+     'hostname'),
+    ('invalid_ip_address',
+     {'device': {'hostname': 'test-router', 'ip_address': '999.999.999.999',
+                 'device_type': 'cisco_ios'}},
+     None),
+    ('interface_without_subnet_mask',
+     {'device': dict(DEVICE, device_type='cisco_ios'),
+      'interfaces': [{'name': 'GigabitEthernet0/0', 'ip_address': '10.0.0.1',
+                      'status': 'up'}]},
+     None),
+    ('interface_without_description',
+     {'device': DEVICE,
+      'interfaces': [{'name': 'GigabitEthernet0/0', 'ip_address': '10.0.0.1',
+                      'subnet_mask': '255.255.255.0', 'status': 'up'}]},
+     'description'),
+    ('interface_without_status',
+     {'device': DEVICE,
+      'interfaces': [{'name': 'GigabitEthernet0/0', 'description': 'Test Interface',
+                      'ip_address': '10.0.0.1', 'subnet_mask': '255.255.255.0'}]},
+     'status'),
+    ('acl_rule_without_protocol',
+     {'device': DEVICE,
+      'security': {'access_lists': [
+          {'name': 'TEST-ACL', 'type': 'extended',
+           'rules': [{'action': 'permit', 'source': 'any', 'destination': 'any'}]}]}},
+     'protocol'),
+    ('acl_rule_without_source',
+     {'device': DEVICE,
+      'security': {'access_lists': [
+          {'name': 'TEST-ACL', 'type': 'extended',
+           'rules': [{'action': 'permit', 'protocol': 'tcp', 'destination': 'any'}]}]}},
+     'source'),
+]
+
 
 class TestConfigValidation(unittest.TestCase):
     """Test cases for configuration validation"""
-    
+
+    @classmethod
+    def setUpClass(cls):
+        # One tmpdir for the whole class; per-test mkstemp/unlink pairs
+        # cost a pair of filesystem metadata syscalls each
+        cls._tmp = tempfile.TemporaryDirectory()
+        cls._counter = itertools.count()
+        # One validator reused across cases; load() resets its state
+        cls.validator = ConfigValidator.from_dict({})
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._tmp.cleanup()
+
     def create_temp_config(self, config_dict):
         """Create a temporary YAML config file"""
-        fd, path = tempfile.mkstemp(suffix='.yaml')
+        path = os.path.join(self._tmp.name, f'cfg_{next(self._counter)}.yaml')
+        # Dump to a string and issue a single os.write; these blobs are
+        # far smaller than the buffered text writer's 8 KB chunking
+        payload = yaml.dump(config_dict, Dumper=_Dumper).encode('utf-8')
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
         try:
-            with os.fdopen(fd, 'w') as f:
-                yaml.dump(config_dict, f)
-            return path
-        except Exception:
+            os.write(fd, payload)
+        finally:
             os.close(fd)
-            os.unlink(path)
-            raise
-    
+        return path
+
     def test_valid_config(self):
-        """Test validation of a valid configuration"""
+        """Test validation of a valid configuration loaded from a file"""
         config = {
             'device': {
                 'hostname': 'test-router',
@@ -48,53 +112,14 @@ class TestConfigValidation(unittest.TestCase):
                 }
             ]
         }
-        
-        config_file = self.create_temp_config(config)
-        try:
-            validator = ConfigValidator(config_file)
-            validator.validate_all()
-            self.assertTrue(validator.is_valid(), "Valid config should pass validation")
-        finally:
-            os.unlink(config_file)
-    
-    def test_missing_hostname(self):
-        """Test validation fails when hostname is missing"""
-        config = {
-            'device': {
-                'ip_address': '192.168.1.1',
-                'device_type': 'cisco_ios'
-            }
-        }
-        
-        config_file = self.create_temp_config(config)
-        try:
-            validator = ConfigValidator(config_file)
-            validator.validate_all()
-            self.assertFalse(validator.is_valid(), "Config without hostname should fail")
-            self.assertTrue(any('hostname' in error.lower() for error in validator.errors))
-        finally:
-            os.unlink(config_file)
-    
-    def test_invalid_ip_address(self):
-        """Test validation fails with invalid IP address"""
-        config = {
-            'device': {
-                'hostname': 'test-router',
-                'ip_address': '999.999.999.999',
-                'device_type': 'cisco_ios'
-            }
-        }
-        
+
         config_file = self.create_temp_config(config)
-        try:
-            validator = ConfigValidator(config_file)
-            validator.validate_all()
-            self.assertFalse(validator.is_valid(), "Config with invalid IP should fail")
-        finally:
-            os.unlink(config_file)
-    
-    def test_interface_without_subnet_mask(self):
-        """Test validation fails when interface has IP but no subnet mask"""
+        validator = ConfigValidator(config_file)
+        validator.validate_all()
+        self.assertTrue(validator.is_valid(), "Valid config should pass validation")
+
+    def test_valid_config_from_stream(self):
+        """Test validation of YAML read from an in-memory stream"""
         config = {
             'device': {
                 'hostname': 'test-router',
@@ -104,123 +129,41 @@ class TestConfigValidation(unittest.TestCase):
             'interfaces': [
                 {
                     'name': 'GigabitEthernet0/0',
-                    'ip_address': '10.0.0.1',
-                    'status': 'up'
-                }
-            ]
-        }
-        
-        config_file = self.create_temp_config(config)
-        try:
-            validator = ConfigValidator(config_file)
-            validator.validate_all()
-            self.assertFalse(validator.is_valid(), "Interface with IP but no mask should fail")
-        finally:
-            os.unlink(config_file)
-
-    def test_interface_without_description(self):
-        """Test validation fails when interface is missing description"""
-        config = {
-            'device': {
-                'hostname': 'test-router',
-                'ip_address': '192.168.1.1'
-            },
-            'interfaces': [
-                {
-                    'name': 'GigabitEthernet0/0',
+                    'description': 'Test Interface',
                     'ip_address': '10.0.0.1',
                     'subnet_mask': '255.255.255.0',
                     'status': 'up'
                 }
             ]
         }
-        
-        config_file = self.create_temp_config(config)
-        try:
-            validator = ConfigValidator(config_file)
-            validator.validate_all()
-            self.assertFalse(validator.is_valid(), "Interface without description should fail")
-            self.assertTrue(any('description' in error.lower() for error in validator.errors))
-        finally:
-            os.unlink(config_file)
 
-    def test_interface_without_status(self):
-        """Test validation fails when interface is missing status"""
-        config = {
-            'device': {
-                'hostname': 'test-router',
-                'ip_address': '192.168.1.1'
-            },
-            'interfaces': [
-                {
-                    'name': 'GigabitEthernet0/0',
-                    'description': 'Test Interface',
-                    'ip_address': '10.0.0.1',
-                    'subnet_mask': '255.255.255.0'
-                }
-            ]
-        }
-        
-        config_file = self.create_temp_config(config)
-        try:
-            validator = ConfigValidator(config_file)
-            validator.validate_all()
-            self.assertFalse(validator.is_valid(), "Interface without status should fail")
-            self.assertTrue(any('status' in error.lower() for error in validator.errors))
-        finally:
-            os.unlink(config_file)
+        stream = io.StringIO(yaml.dump(config, Dumper=_Dumper))
+        validator = ConfigValidator.from_stream(stream)
+        validator.validate_all()
+        self.assertTrue(validator.is_valid(), "Valid config should pass validation")
 
-    def test_acl_rule_without_protocol(self):
-        """Test validation fails when ACL rule is missing protocol"""
-        config = {
-            'device': {'hostname': 'test-router', 'ip_address': '192.168.1.1'},
-            'security': {
-                'access_lists': [
-                    {
-                        'name': 'TEST-ACL',
-                        'type': 'extended',
-                        'rules': [
-                            {'action': 'permit', 'source': 'any', 'destination': 'any'}
-                        ]
-                    }
-                ]
-            }
-        }
-        config_file = self.create_temp_config(config)
-        try:
-            validator = ConfigValidator(config_file)
-            validator.validate_all()
-            self.assertFalse(validator.is_valid(), "ACL rule without protocol should fail")
-            self.assertTrue(any('protocol' in error for error in validator.errors))
-        finally:
-            os.unlink(config_file)
+    def test_validate_many(self):
+        """validate_many shares one validator across a batch of configs"""
+        results = list(ConfigValidator.validate_many(
+            config for _, config, _ in INVALID_CASES))
+        self.assertEqual(len(results), len(INVALID_CASES))
+        for (label, _, _), (errors, is_valid) in zip(INVALID_CASES, results):
+            with self.subTest(label):
+                self.assertFalse(is_valid, f"{label} should fail validation")
+                self.assertTrue(errors)
 
-    def test_acl_rule_without_source(self):
-        """Test validation fails when ACL rule is missing source"""
-        config = {
-            'device': {'hostname': 'test-router', 'ip_address': '192.168.1.1'},
-            'security': {
-                'access_lists': [
-                    {
-                        'name': 'TEST-ACL',
-                        'type': 'extended',
-                        'rules': [
-                            {'action': 'permit', 'protocol': 'tcp', 'destination': 'any'}
-                        ]
-                    }
-                ]
-            }
-        }
-        config_file = self.create_temp_config(config)
-        try:
-            validator = ConfigValidator(config_file)
-            validator.validate_all()
-            self.assertFalse(validator.is_valid(), "ACL rule without source should fail")
-            self.assertTrue(any('source' in error for error in validator.errors))
-        finally:
-            os.unlink(config_file)
+    def test_invalid_configs(self):
+        """Each invalid-config case should fail with the expected error"""
+        for label, config, needle in INVALID_CASES:
+            with self.subTest(label):
+                validator = self.validator.load(config)
+                validator.validate_all()
+                self.assertFalse(validator.is_valid(), f"{label} should fail validation")
+                if needle is not None:
+                    self.assertTrue(
+                        validator.has_error_containing(needle),
+                        f"expected an error mentioning {needle!r}: {validator.errors}")
 
 
 if __name__ == '__main__':
     unittest.main()
-
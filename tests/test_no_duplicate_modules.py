@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Guard against duplicate module definitions under scripts/
+"""
+
+import ast
+import os
+import unittest
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(__file__), '..', 'scripts')
+
+
+class TestNoDuplicateModules(unittest.TestCase):
+    """Ensure no two script files define the same top-level class"""
+
+    def test_no_duplicate_top_level_classes(self):
+        """Each top-level class should be defined in exactly one file"""
+        seen = {}
+        for filename in sorted(os.listdir(SCRIPTS_DIR)):
+            if not filename.endswith('.py'):
+                continue
+            path = os.path.join(SCRIPTS_DIR, filename)
+            with open(path, 'r') as f:
+                tree = ast.parse(f.read(), filename=filename)
+            for node in tree.body:
+                if isinstance(node, ast.ClassDef):
+                    self.assertNotIn(
+                        node.name, seen,
+                        f"Class {node.name} defined in both {seen.get(node.name)} "
+                        f"and {filename}")
+                    seen[node.name] = filename
+
+
+if __name__ == '__main__':
+    unittest.main()